@@ -0,0 +1,29 @@
+import boto3
+import threading
+from botocore.config import Config
+
+# One session shared by every manager class: credential-provider
+# resolution, the endpoint resolver and the service-model cache are done
+# once per process instead of once per class.
+_DEFAULT_CFG = Config(tcp_keepalive=True, max_pool_connections=64,
+                      retries={'mode': 'adaptive', 'max_attempts': 10})
+
+session = boto3.session.Session()
+
+# Session.client()/resource() are not thread-safe, and lazy cached_property
+# clients can be first touched from worker threads (e.g. the 32-way fan-out
+# in retrieve_and_process_images). Serialize construction; the clients
+# handed out are themselves safe to share across threads.
+_session_lock = threading.Lock()
+
+def client(service, **kwargs):
+    """Build a service client on the shared session with the default Config."""
+    kwargs.setdefault('config', _DEFAULT_CFG)
+    with _session_lock:
+        return session.client(service, **kwargs)
+
+def resource(service, **kwargs):
+    """Build a service resource on the shared session with the default Config."""
+    kwargs.setdefault('config', _DEFAULT_CFG)
+    with _session_lock:
+        return session.resource(service, **kwargs)
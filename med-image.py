@@ -1,16 +1,49 @@
-import boto3
+import _aws
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import cached_property
 
 class MedicalDeviceInfrastructure:
-    def __init__(self):
-        self.ec2_client = boto3.client('ec2')
-        self.s3_client = boto3.client('s3')
-        self.rds_client = boto3.client('rds')
-        self.efs_client = boto3.client('efs')
-        self.sagemaker_client = boto3.client('sagemaker')
-        self.quicksight_client = boto3.client('quicksight')
-        self.direct_connect_client = boto3.client('directconnect')
-        self.elb_client = boto3.client('elbv2')
-        self.athena_client = boto3.client('athena')
+    def _client(self, service):
+        """Build a client on the shared session with keep-alive and a tuned pool."""
+        return _aws.client(service)
+
+    # Clients are built lazily on first use so unused services never pay
+    # botocore's service-model loading at instantiation time.
+    @cached_property
+    def ec2_client(self):
+        return self._client('ec2')
+
+    @cached_property
+    def s3_client(self):
+        return self._client('s3')
+
+    @cached_property
+    def rds_client(self):
+        return self._client('rds')
+
+    @cached_property
+    def efs_client(self):
+        return self._client('efs')
+
+    @cached_property
+    def sagemaker_client(self):
+        return self._client('sagemaker')
+
+    @cached_property
+    def quicksight_client(self):
+        return self._client('quicksight')
+
+    @cached_property
+    def direct_connect_client(self):
+        return self._client('directconnect')
+
+    @cached_property
+    def elb_client(self):
+        return self._client('elbv2')
+
+    @cached_property
+    def athena_client(self):
+        return self._client('athena')
 
     def setup_vpc_and_gateway(self):
         """Setup VPC and a gateway for secure network configuration."""
@@ -97,6 +130,49 @@ class MedicalDeviceInfrastructure:
             }
         )
         print("AWS SageMaker Model deployed:", model['ModelArn'])
+        # Two endpoints on the same model: a real-time one for the batched
+        # invoke_endpoint path and an async one for the bulk pipeline. An
+        # endpoint config with AsyncInferenceConfig only accepts async
+        # invocations, so one endpoint cannot serve both modes.
+        endpoint_config = self.sagemaker_client.create_endpoint_config(
+            EndpointConfigName='ImageAnalysisEndpointConfig',
+            ProductionVariants=[{
+                'VariantName': 'AllTraffic',
+                'ModelName': 'ImageAnalysisModel',
+                'InstanceType': 'ml.m5.large',
+                'InitialInstanceCount': 2,
+                # Route to the instance with the fewest in-flight requests
+                # instead of round-robin, which smooths warm/cold skew.
+                'RoutingConfig': {'RoutingStrategy': 'LEAST_OUTSTANDING_REQUESTS'}
+            }]
+        )
+        print("AWS SageMaker Endpoint Config created:", endpoint_config['EndpointConfigArn'])
+        endpoint = self.sagemaker_client.create_endpoint(
+            EndpointName='dicom-image-analysis-endpoint',
+            EndpointConfigName='ImageAnalysisEndpointConfig'
+        )
+        print("AWS SageMaker Endpoint created:", endpoint['EndpointArn'])
+        async_endpoint_config = self.sagemaker_client.create_endpoint_config(
+            EndpointConfigName='ImageAnalysisAsyncEndpointConfig',
+            ProductionVariants=[{
+                'VariantName': 'AllTraffic',
+                'ModelName': 'ImageAnalysisModel',
+                'InstanceType': 'ml.m5.large',
+                'InitialInstanceCount': 2
+            }],
+            AsyncInferenceConfig={
+                'OutputConfig': {
+                    'S3OutputPath': 's3://my-model-bucket/async-results/',
+                    'S3FailureOutputPath': 's3://my-model-bucket/async-failures/'
+                }
+            }
+        )
+        print("AWS SageMaker Async Endpoint Config created:", async_endpoint_config['EndpointConfigArn'])
+        async_endpoint = self.sagemaker_client.create_endpoint(
+            EndpointName='dicom-image-analysis-endpoint-async',
+            EndpointConfigName='ImageAnalysisAsyncEndpointConfig'
+        )
+        print("AWS SageMaker Async Endpoint created:", async_endpoint['EndpointArn'])
 
     def setup_aws_athena_for_query(self):
         """Setup AWS Athena for querying data."""
@@ -133,13 +209,22 @@ class MedicalDeviceInfrastructure:
 
 # Example usage
 infrastructure = MedicalDeviceInfrastructure()
+# VPC, ELB and the EC2 deployment build on each other, so they run in order.
 infrastructure.setup_vpc_and_gateway()
 infrastructure.configure_aws_elb()
 infrastructure.deploy_dicom_on_ec2()
-infrastructure.setup_direct_connect()
-infrastructure.create_s3_bucket_for_dicom()
-infrastructure.configure_aws_rds()
-infrastructure.setup_aws_efs()
-infrastructure.deploy_aws_sagemaker_model()
+# The remaining setup steps are independent of each other, so they run
+# concurrently and total wall-clock is the slowest step, not the sum.
+independent_steps = [
+    infrastructure.setup_direct_connect,
+    infrastructure.create_s3_bucket_for_dicom,
+    infrastructure.configure_aws_rds,
+    infrastructure.setup_aws_efs,
+    infrastructure.deploy_aws_sagemaker_model,
+    infrastructure.setup_aws_quicksight_for_visualization,
+]
+with ThreadPoolExecutor(max_workers=len(independent_steps)) as executor:
+    for future in as_completed([executor.submit(step) for step in independent_steps]):
+        future.result()
+# Athena queries the metadata written by the steps above, so it goes last.
 infrastructure.setup_aws_athena_for_query()
-infrastructure.setup_aws_quicksight_for_visualization()